@@ -13,11 +13,37 @@ Database:
 """
 
 import os
+import sqlite3
+import click
 from datetime import datetime
-from flask import Flask, request, render_template, redirect, url_for
-from sqlalchemy import or_
-from sqlalchemy.orm import joinedload
-from data_models import db, Author, Book
+from flask import Flask, g, request, render_template, redirect, url_for
+from flask_caching import Cache
+from sqlalchemy import (
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    exists,
+    insert,
+    literal_column,
+    or_,
+    select,
+    String,
+    tuple_,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import load_only, raiseload
+from data_models import (
+    db,
+    Author,
+    Book,
+    book_search,
+    create_author_name_sync,
+    create_search_index,
+    migrate_isbn_to_integer,
+)
 from sqlalchemy.exc import IntegrityError
 import re
 
@@ -39,16 +65,17 @@ def normalize_author_name(name: str) -> str:
     return name.lower()
 
 
-def normalize_isbn(isbn: str) -> str | None:
+def normalize_isbn(isbn: str) -> int | None:
     """
-    Normalize ISBN for storage and comparison.
+    Normalize ISBN to its 13-digit form, as an integer for storage and comparison.
 
     Rules:
     - Remove spaces and hyphens
-    - Allow digits
-    - Allow trailing X (ISBN-10)
-    - Uppercase X
+    - ISBN-13: 13 digits
+    - ISBN-10: 9 digits plus a digit or X (any case); converted to ISBN-13
+      (978 prefix, recomputed check digit)
     - Reject anything else
+    Example: "0-451-52634-1" -> 9780451526342
     """
     if not isbn:
         return None
@@ -56,11 +83,45 @@ def normalize_isbn(isbn: str) -> str | None:
     # Remove spaces and hyphens
     cleaned = isbn.replace(" ", "").replace("-", "").upper()
 
-    # ISBN must be digits, optionally ending with X
-    if not re.fullmatch(r"\d+X?", cleaned):
-        return None
+    if re.fullmatch(r"\d{13}", cleaned):
+        return int(cleaned)
+
+    if re.fullmatch(r"\d{9}[\dX]", cleaned):
+        digits = "978" + cleaned[:9]
+        weighted_sum = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits))
+        return int(digits + str(-weighted_sum % 10))
+
+    return None
+
+
+def to_search_phrase(query: str) -> str:
+    """
+    Quote user input as a single FTS5 phrase for a MATCH against `book_search`.
+    Embedded double quotes are doubled. Example: 'orwell' -> '"orwell"'
+    """
+    return '"' + query.replace('"', '""') + '"'
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for a read-heavy web workload.
+
+    - WAL lets readers (the homepage) proceed while a write is in progress.
+    - synchronous=NORMAL is safe with WAL and avoids an fsync on every commit.
+    - Temp tables/sorts in memory, a 256 MB mmap window and a ~64 MB page cache
+      keep hot pages out of the read() syscall path.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
 
-    return cleaned
 
 # Resolve the absolute project directory so the SQLite path works regardless of where
 # the app is started from (e.g., different working directories).
@@ -72,16 +133,184 @@ app = Flask(__name__)
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(basedir, 'data/library.sqlite')}"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Pool settings for the SQLite file. These are SQLAlchemy 2.x's own defaults for a
+# file database, written out only so they don't silently change with an upgrade or
+# a switch of URI: a QueuePool keeps connections (and their connect PRAGMAs) open
+# across requests, and check_same_thread=False lets a pooled connection be handed
+# to another thread. Do not swap in StaticPool: it shares one connection between
+# all threads, so concurrent requests would interleave statements in the same
+# SQLite transaction.
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "poolclass": QueuePool,
+    "pool_size": 5,
+    "max_overflow": 10,
+    "connect_args": {"check_same_thread": False},
+}
+
+# In-process cache for rendered pages; entries are dropped whenever books change.
+app.config["CACHE_TYPE"] = "SimpleCache"
+app.config["CACHE_DEFAULT_TIMEOUT"] = 60
+cache = Cache(app)
+
 # Bind the SQLAlchemy instance (defined in data_models.py) to this Flask app.
 db.init_app(app)
 
-# One-time initialization helper: create tables based on the models in data_models.py.
-# Run once, then comment out to avoid accidentally recreating tables.
-#with app.app_context():
-#    db.create_all()
+
+def init_database() -> None:
+    """Create missing tables and indexes for the models in data_models.py.
+
+    `db.create_all()` only creates tables that do not exist yet, so indexes added to
+    an existing table are created separately (CREATE INDEX IF NOT EXISTS).
+    Safe to run repeatedly; run via `flask db-init` or when starting `python app.py`.
+    """
+    db.create_all()
+    migrate_isbn_to_integer(normalize_isbn)
+
+    # Columns added after a table was created must exist before their indexes.
+    with db.engine.begin() as connection:
+        create_author_name_sync(connection)
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+    with db.engine.begin() as connection:
+        create_search_index(connection)
+
+        # Collect planner statistics (sqlite_stat1) so SQLite picks the indexes above
+        # instead of falling back to nested full scans.
+        connection.exec_driver_sql("ANALYZE")
+
+
+@app.cli.command("db-init")
+def db_init_command():
+    """Create/migrate the database schema (`flask --app app db-init`).
+
+    Kept out of module import so that importing the app (WSGI servers,
+    `flask --help`, other CLI commands) does no database work.
+    """
+    try:
+        init_database()
+    except RuntimeError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo("Database initialized.")
+
+
+@app.teardown_appcontext
+def optimize_database(exception=None):
+    """Refresh SQLite planner statistics after a request that modified data.
+
+    `PRAGMA optimize` only re-analyzes tables whose row counts changed significantly
+    since the last ANALYZE, so it is cheap when little has changed.
+    """
+    if exception is None and g.pop("db_modified", False):
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql("PRAGMA optimize")
+
+
+# Homepage page size (overridable with `?limit=`, capped at the maximum).
+BOOKS_PER_PAGE = 50
+MAX_BOOKS_PER_PAGE = 200
+
+# Search filters for home(), built once at import time. The user input is only
+# supplied through bind parameters at execution time, so every search reuses the
+# same expression objects and SQLAlchemy's compiled-statement cache entry.
+SEARCH_MATCH_FILTER = Book.id.in_(
+    select(book_search.c.rowid).where(
+        literal_column("book_search").op("MATCH")(bindparam("search_phrase", type_=String))
+    )
+)
+# Short terms: title substring scan, plus an author-name *prefix* match answered as
+# a range scan on the UNIQUE index over Author.name_normalized (no per-row LOWER/LIKE).
+SEARCH_SHORT_FILTER = or_(
+    Book.title.ilike(bindparam("search_pattern", type_=String)),
+    Book.author_id.in_(
+        select(Author.id).where(
+            Author.name_normalized >= bindparam("author_prefix", type_=String),
+            Author.name_normalized < bindparam("author_prefix_end", type_=String),
+        )
+    ),
+)
+
+
+def build_book_query(
+    sort_option: str, order_option: str, search_query: str, after: tuple | None = None
+):
+    """Build the homepage book query (also used by `flask check-query-plans`).
+
+    Args:
+        sort_option: "author" sorts by author name; anything else sorts by title.
+        order_option: "desc" for descending; anything else is ascending.
+        search_query: Stripped search text; empty means no filtering.
+        after: Keyset pagination cursor: the sort key of the last book on the
+            previous page, i.e. (author_name, title, id) when sorting by author and
+            (title, id) otherwise. Only books sorting after it are returned; the
+            cursor book itself does not need to exist anymore.
+
+    Returns:
+        A `select(Book)` statement, ready for `.limit(...)` and `db.session.scalars()`.
+    """
+    # The author name is denormalized onto Book, so listing, sorting and searching
+    # need no join with Author at all.
+    # raiseload("*") turns any relationship access (e.g. `book.author`) into an
+    # error instead of a silent per-book lazy load, so N+1 patterns fail loudly.
+    # load_only restricts the query to the columns home.html actually renders;
+    # with raiseload=True, touching any other column raises instead of lazy-loading.
+    stmt = select(Book).options(
+        load_only(
+            Book.id,
+            Book.isbn,
+            Book.title,
+            Book.publication_year,
+            Book.author_name,
+            raiseload=True,
+        ),
+        raiseload("*"),
+    )
+
+    # Apply search only if the user typed something. Both paths are case-insensitive.
+    if len(search_query) >= 3:
+        # Look the matching book ids up in the trigram FTS index.
+        stmt = stmt.where(SEARCH_MATCH_FILTER).params(
+            search_phrase=to_search_phrase(search_query)
+        )
+    elif search_query:
+        # Trigrams need at least 3 characters; shorter terms match title substrings
+        # and author name prefixes. Every string starting with the prefix sorts
+        # between the prefix and the prefix followed by the highest code point.
+        author_prefix = normalize_author_name(search_query)
+        stmt = stmt.where(SEARCH_SHORT_FILTER).params(
+            search_pattern=f"%{search_query}%",
+            author_prefix=author_prefix,
+            author_prefix_end=author_prefix + "\U0010ffff",
+        )
+
+    # Map the UI "sort" option to the actual SQLAlchemy columns to order by.
+    # Books by the same author are ordered by title (free via ix_book_author_name_title),
+    # and id makes the order total so it can serve as a pagination key (the indexes
+    # end with the rowid, so this is free too).
+    if sort_option == "author":
+        sort_columns = (Book.author_name, Book.title, Book.id)
+    else:
+        sort_columns = (Book.title, Book.id)
+
+    # Keyset pagination: continue right after the cursor's sort key. Unlike
+    # OFFSET, this seeks into the sort index instead of reading and discarding rows.
+    if after is not None:
+        row_key = tuple_(*sort_columns)
+        cursor_key = tuple_(*after)
+        stmt = stmt.where(
+            row_key < cursor_key if order_option == "desc" else row_key > cursor_key
+        )
+
+    # Apply ascending/descending order.
+    return stmt.order_by(
+        *(column.desc() if order_option == "desc" else column.asc() for column in sort_columns)
+    )
 
 
 @app.route("/")
+@cache.cached(timeout=60, query_string=True)
 def home():
     """Render the library homepage.
 
@@ -90,6 +319,12 @@ def home():
     - Sort by title or author using `sort` (title|author).
     - Sort direction using `order` (asc|desc).
     - Optional status message via `msg` query parameter (used after actions like delete).
+    - Keyset pagination via `after_title`, `after_author` (author sort only) and
+      `after_id`, the sort key of the previous page's last book, and `limit`
+      (page size, default 50, max 200). An incomplete cursor shows the first page.
+
+    The rendered page is cached per query string and invalidated by add_book()
+    and delete_book().
 
     Returns:
         Rendered home.html template with the current list of books and UI state.
@@ -100,29 +335,30 @@ def home():
     search_query = request.args.get("q", "").strip()
     message = request.args.get("msg")
 
-    # Use joinedload so accessing `book.author` in the template does not trigger
-    # an extra database query per book (avoids the N+1 query problem).
-    query = Book.query.options(joinedload(Book.author))
-
-    # Join Author because we want to filter/sort by author attributes too.
-    query = query.join(Author)
-
-    # Apply search only if the user typed something. `ilike` is case-insensitive.
-    if search_query:
-        query = query.filter(
-            or_(
-                Book.title.ilike(f"%{search_query}%"),
-                Author.name.ilike(f"%{search_query}%"),
-            )
-        )
-
-    # Map the UI "sort" option to the actual SQLAlchemy column to order by.
-    sort_column = Author.name if sort_option == "author" else Book.title
-
-    # Apply ascending/descending order.
-    query = query.order_by(sort_column.desc() if order_option == "desc" else sort_column.asc())
-
-    books = query.all()
+    limit = min(max(request.args.get("limit", BOOKS_PER_PAGE, type=int), 1), MAX_BOOKS_PER_PAGE)
+
+    # The cursor carries the sort key values themselves, so it stays valid even if
+    # that book has been deleted in the meantime.
+    after_id = request.args.get("after_id", type=int)
+    after_title = request.args.get("after_title")
+    after_author = request.args.get("after_author")
+    if after_id is None or after_title is None:
+        after = None
+    elif sort_option == "author":
+        after = (after_author, after_title, after_id) if after_author is not None else None
+    else:
+        after = (after_title, after_id)
+
+    # Fetch one extra row to learn whether there is a next page.
+    stmt = build_book_query(sort_option, order_option, search_query, after)
+    books = db.session.scalars(stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(books) > limit:
+        last_book = books[limit - 1]
+        next_cursor = {"after_title": last_book.title, "after_id": last_book.id}
+        if sort_option == "author":
+            next_cursor["after_author"] = last_book.author_name
+    books = books[:limit]
 
     return render_template(
         "home.html",
@@ -131,9 +367,23 @@ def home():
         current_order=order_option,
         search_query=search_query,
         message=message,
+        is_first_page=after is None,
+        next_cursor=next_cursor,
+        limit=request.args.get("limit", type=int),
     )
 
 
+@cache.memoize(timeout=30)
+def get_author_choices():
+    """Return authors for the add_book dropdown as `{"id", "name"}` dicts, sorted by name.
+
+    Only the two columns the <select> needs are queried (no ORM objects). The result
+    is cached and invalidated whenever authors are added or deleted.
+    """
+    rows = Author.query.with_entities(Author.id, Author.name).order_by(Author.name).all()
+    return [row._asdict() for row in rows]
+
+
 @app.route("/add_author", methods=["GET", "POST"])
 def add_author():
     """Create a new Author.
@@ -209,6 +459,8 @@ def add_author():
         try:
             db.session.add(new_author)
             db.session.commit()
+            g.db_modified = True
+            cache.delete_memoized(get_author_choices)
             success_message = "Author successfully created."
         except IntegrityError:
             db.session.rollback()
@@ -241,9 +493,6 @@ def add_book():
         title, publication_year, isbn, author_id
     """
 
-    # Load authors for the dropdown (GET and POST)
-    authors = Author.query.order_by(Author.name).all()
-
     if request.method == "POST":
         raw_isbn = request.form.get("isbn")
         title = request.form.get("title")
@@ -258,7 +507,7 @@ def add_book():
             error_message = "All fields are required and ISBN must be valid."
             return render_template(
                 "add_book.html",
-                authors=authors,
+                authors=get_author_choices(),
                 error_message=error_message,
             )
 
@@ -268,57 +517,54 @@ def add_book():
         except ValueError:
             return render_template(
                 "add_book.html",
-                authors=authors,
+                authors=get_author_choices(),
                 error_message="Publication year must be a number.",
             )
 
         # Check author exists
-        author = Author.query.get(author_id)
+        author = db.session.get(Author, author_id)
         if not author:
             return render_template(
                 "add_book.html",
-                authors=authors,
+                authors=get_author_choices(),
                 error_message="Selected author does not exist.",
             )
 
-        # Check ISBN uniqueness
-        existing_book = Book.query.filter_by(isbn=normalized_isbn).first()
-        if existing_book:
-            return render_template(
-                "add_book.html",
-                authors=authors,
-                error_message="ISBN already exists.",
+        # Insert the book; the UNIQUE index on isbn does the duplicate check, so there
+        # is no separate lookup and no INSERT + IntegrityError + rollback round-trip.
+        result = db.session.execute(
+            sqlite_insert(Book)
+            .values(
+                isbn=normalized_isbn,
+                title=title.strip(),
+                publication_year=publication_year,
+                author_id=author.id,
+                author_name=author.name,
             )
-
-        # Create book
-        new_book = Book(
-            isbn=normalized_isbn,
-            title=title.strip(),
-            publication_year=publication_year,
-            author_id=author.id,
+            .on_conflict_do_nothing(index_elements=[Book.isbn])
         )
+        db.session.commit()
 
-        try:
-            db.session.add(new_book)
-            db.session.commit()
-            success_message = "Book successfully created."
-        except IntegrityError:
-            db.session.rollback()
+        if result.rowcount == 0:
             return render_template(
                 "add_book.html",
-                authors=authors,
+                authors=get_author_choices(),
                 error_message="ISBN already exists.",
             )
 
+        g.db_modified = True
+        cache.clear()
+        success_message = "Book successfully created."
+
         return render_template(
             "add_book.html",
-            authors=authors,
+            authors=get_author_choices(),
             success_message=success_message,
         )
 
     return render_template(
         "add_book.html",
-        authors=authors,
+        authors=get_author_choices(),
     )
     """success_message = None
     error_message = None
@@ -354,6 +600,98 @@ def add_book():
     )"""
 
 
+def bulk_insert_books(rows) -> None:
+    """Insert many books at once (for seeding or imports).
+
+    Uses a single executemany INSERT inside one transaction instead of one
+    `db.session.add()` + commit per book, so there is no per-object unit-of-work
+    bookkeeping and one commit (one WAL sync) covers the whole batch.
+    The book_search triggers keep the search index in sync.
+
+    Args:
+        rows: List of dicts with `isbn`, `title`, `publication_year` and `author_id`.
+            Values must already be validated (e.g. ISBN via `normalize_isbn`).
+            `author_name` is filled in from the authors table.
+
+    Raises:
+        ValueError: Listing every author_id that has no author row.
+        IntegrityError: If an ISBN already exists (or repeats within `rows`).
+        Nothing is inserted and the session is rolled back on any error.
+    """
+    if not rows:
+        return
+
+    try:
+        # One lookup for all distinct authors to fill the denormalized author_name.
+        author_ids = {row["author_id"] for row in rows}
+        author_names = dict(
+            db.session.execute(
+                select(Author.id, Author.name).where(Author.id.in_(author_ids))
+            ).all()
+        )
+        missing = sorted(author_ids - author_names.keys())
+        if missing:
+            raise ValueError(
+                "Cannot insert books; these authors do not exist: "
+                + ", ".join(str(author_id) for author_id in missing)
+            )
+        rows = [{**row, "author_name": author_names[row["author_id"]]} for row in rows]
+
+        db.session.execute(insert(Book), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Large batches shift row counts enough for PRAGMA optimize to re-analyze.
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+    cache.clear()
+
+
+def delete_books_statement(book_ids):
+    """DELETE for the given books, returning (title, author_id) of each deleted row."""
+    return (
+        delete(Book)
+        .where(Book.id.in_(book_ids))
+        .returning(Book.title, Book.author_id)
+    )
+
+
+def delete_orphaned_authors_statement(author_ids):
+    """DELETE for those of the given authors that no longer have any books."""
+    return (
+        delete(Author)
+        .where(Author.id.in_(author_ids))
+        .where(~exists().where(Book.author_id == Author.id))
+    )
+
+
+def delete_books(book_ids):
+    """Delete books by primary key and remove authors left without any books.
+
+    Works for one or many ids with two statements in total: the book DELETE
+    returns the affected author ids, and the author DELETE is limited to those
+    authors and guarded by a correlated NOT EXISTS, which stops at the first
+    remaining book instead of counting them all.
+
+    Must be called inside a transaction (e.g. `with db.session.begin():`).
+
+    Args:
+        book_ids: Iterable of Book primary keys.
+
+    Returns:
+        List of (title, author_id) rows for the books that were actually deleted.
+    """
+    deleted = db.session.execute(delete_books_statement(book_ids)).all()
+
+    author_ids = {row.author_id for row in deleted}
+    if author_ids:
+        db.session.execute(delete_orphaned_authors_statement(author_ids))
+
+    return deleted
+
+
 @app.route("/book/<int:book_id>/delete", methods=["POST"])
 def delete_book(book_id: int):
     """Delete a single book.
@@ -372,33 +710,125 @@ def delete_book(book_id: int):
     Returns:
         Redirect response to the homepage (/) with a `msg` query parameter.
     """
-    # Look up the book by primary key.
-    book = Book.query.get(book_id)
+    with db.session.begin():
+        deleted = delete_books([book_id])
 
     # If it was already deleted (or never existed), do not crash—just redirect.
-    if book is None:
+    if not deleted:
         return redirect(url_for("home", msg="Book not found (already deleted)."))
 
-    # Keep the title for the user message after deletion.
-    title = book.title
+    title = deleted[0].title
 
-    # Cache author info before deleting the book row.
-    author = book.author
-    author_id = book.author_id
+    g.db_modified = True
+    cache.clear()
+    return redirect(url_for("home", msg=f'Deleted "{title}" successfully.'))
 
-    # Count other books by the same author (excluding the current book).
-    remaining = Book.query.filter(Book.author_id == author_id, Book.id != book_id).count()
 
-    # Delete the book.
-    db.session.delete(book)
+# "SCAN book" on SQLite >= 3.36, "SCAN TABLE book" on older versions.
+FULL_SCAN_PLAN = re.compile(r"^SCAN (TABLE )?(book|author)$")
 
-    # Optional cleanup: remove the author if they have no books left in the library.
-    if remaining == 0 and author is not None:
-        db.session.delete(author)
 
-    db.session.commit()
-    return redirect(url_for("home", msg=f'Deleted "{title}" successfully.'))
+def is_sort_plan(detail: str) -> bool:
+    """
+    True if an EXPLAIN QUERY PLAN line sorts rows for ORDER BY in a temp B-tree.
+    Also matches partial sorts where an index only provides the leading sort column,
+    e.g. "USE TEMP B-TREE FOR RIGHT PART OF ORDER BY" / "... LAST TERM OF ORDER BY".
+    """
+    return detail.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in detail
+
+
+@app.cli.command("check-query-plans")
+def check_query_plans():
+    """Fail if the homepage or delete queries stop using their indexes.
+
+    Builds the schema in a throwaway in-memory database, fills it with synthetic
+    authors and books, runs ANALYZE and inspects EXPLAIN QUERY PLAN for each query.
+    A full table scan of book/author or a (full or partial) temp B-tree sort for
+    ORDER BY is reported as a regression (temp B-trees only for the unfiltered listing) and the command exits
+    with status 1 (meant for CI).
+
+    The 1-2 character search fallback is not checked: it scans by design.
+    """
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        create_author_name_sync(connection)
+        create_search_index(connection)
+        connection.execute(
+            insert(Author),
+            [
+                {
+                    "id": author_id,
+                    "name": f"Author {author_id}",
+                    "name_normalized": f"author {author_id}",
+                    "birth_date": datetime(1900, 1, 1).date(),
+                }
+                for author_id in range(1, 201)
+            ],
+        )
+        connection.execute(
+            insert(Book),
+            [
+                {
+                    "isbn": 9780000000000 + book_id,
+                    "title": f"Book {book_id}",
+                    "publication_year": 2000,
+                    "author_id": book_id % 200 + 1,
+                    "author_name": f"Author {book_id % 200 + 1}",
+                }
+                for book_id in range(1, 5001)
+            ],
+        )
+        connection.exec_driver_sql("ANALYZE")
+
+    # name -> (statement, whether the result must come out of an index already sorted)
+    statements = {
+        "delete book": (delete_books_statement([1]), False),
+        "delete orphaned authors": (delete_orphaned_authors_statement([1]), False),
+    }
+    for sort_option in ("title", "author"):
+        for order_option in ("asc", "desc"):
+            cursor = ("Author 2", "Book 1", 1) if sort_option == "author" else ("Book 1", 1)
+            for search_query, after in (("", None), ("", cursor), ("book 12", None)):
+                name = (
+                    f"home sort={sort_option} order={order_option} "
+                    f"q={search_query!r} after={after}"
+                )
+                statement = build_book_query(
+                    sort_option, order_option, search_query, after
+                ).limit(BOOKS_PER_PAGE + 1)
+                # Search results are a handful of FTS hits; sorting those is fine.
+                statements[name] = (statement, not search_query)
+
+    failures = 0
+    with engine.connect() as connection:
+        for name, (statement, index_ordered) in statements.items():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [
+                row.detail
+                for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            ]
+            regressed = [
+                detail
+                for detail in plan
+                if FULL_SCAN_PLAN.match(detail)
+                or (index_ordered and is_sort_plan(detail))
+            ]
+            status = "FAIL" if regressed else "ok"
+            click.echo(f"[{status}] {name}")
+            for detail in plan:
+                click.echo(f"    {detail}")
+            failures += bool(regressed)
+
+    engine.dispose()
+    if failures:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
+    # Convenience for the dev server; WSGI deployments run `flask db-init` instead.
+    with app.app_context():
+        init_database()
+
     app.run(host="0.0.0.0", port=5002, debug=True)
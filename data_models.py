@@ -6,13 +6,33 @@ Models:
 - Author: Stores basic author metadata and links to their books.
 - Book: Stores book metadata and references an Author via a foreign key.
 
+Search index:
+- book_search: SQLite FTS5 table over book titles and author names, kept in sync
+  with triggers (see `create_search_index`).
+
+Denormalization:
+- Book.author_name copies Author.name so the homepage can list/sort/search books
+  without joining author (see `create_author_name_sync`).
+
+Migrations:
+- Older databases stored book.isbn as text; `migrate_isbn_to_integer` rebuilds
+  the table with integer ISBN-13 values.
+
 The `db` object is initialized in app.py via `db.init_app(app)`.
 """
 
+import re
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import column, insert, table
 
 db = SQLAlchemy()
 
+# Lightweight (non-ORM) handle on the FTS5 table so queries can select from it.
+# It is deliberately not part of `db.metadata`: `create_all()` cannot create
+# virtual tables.
+book_search = table("book_search", column("rowid"), column("title"), column("author_name"))
+
 
 class Author(db.Model):
     """Author table.
@@ -26,8 +46,17 @@ class Author(db.Model):
 
     Relationships:
         books: Collection of Book instances written by this author.
+
+    Indexes:
+        ix_author_name: name, so the add-book author dropdown
+            (`get_author_choices`, ORDER BY name) reads authors in index order
+            instead of sorting them in a temp B-tree.
     """
 
+    __table_args__ = (
+        db.Index("ix_author_name", "name"),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(255), nullable=False)
     name_normalized = db.Column(db.String(255), nullable=False, unique=True)
@@ -53,30 +82,301 @@ class Book(db.Model):
 
     Columns:
         id: Integer primary key.
-        isbn: ISBN string (required; unique).
+        isbn: ISBN-13 as an integer (required; unique).
         title: Book title (required).
         publication_year: Publication year (required).
         author_id: Foreign key referencing Author.id (required).
+        author_name: Copy of the author's name (required; kept in sync by trigger).
 
     Relationships:
         author: The Author instance associated with this book.
+
+    Indexes:
+        ix_book_title: title, so the homepage "sort by title" walks the index in
+            order instead of sorting the result in a temp B-tree.
+        ix_book_author_title: (author_id, title); its leading column indexes the
+            foreign key, so the NOT EXISTS check for orphaned authors after a delete
+            is an index probe per author rather than a scan of book.
+        ix_book_author_name_title: (author_name, title), so "sort by author" walks
+            a single-table index, with ties already ordered by title.
     """
 
+    __table_args__ = (
+        db.Index("ix_book_title", "title"),
+        db.Index("ix_book_author_title", "author_id", "title"),
+        db.Index("ix_book_author_name_title", "author_name", "title"),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    isbn = db.Column(db.String(255), nullable=False, unique=True)
+    isbn = db.Column(db.BigInteger, nullable=False, unique=True)
     title = db.Column(db.String(255), nullable=False)
     publication_year = db.Column(db.Integer, nullable=False)
 
     author_id = db.Column(db.Integer, db.ForeignKey("author.id"), nullable=False)
+    author_name = db.Column(db.String(255), nullable=False)
     author = db.relationship("Author", back_populates="books")
 
     def __repr__(self) -> str:
         """Return a debug-friendly representation (useful in logs and the Python shell)."""
         return (
-            f"Book(title={self.title!r}, id={self.id}, isbn={self.isbn!r}, "
+            f"Book(title={self.title!r}, id={self.id}, isbn={self.isbn}, "
             f"author_id={self.author_id}, publication_year={self.publication_year})"
         )
 
     def __str__(self) -> str:
         """Return a human-friendly string representation (useful for UI output)."""
         return self.title
+
+
+# The trigram tokenizer indexes every 3-character sequence, so MATCH supports
+# case-insensitive substring search just like `ilike('%q%')`, but via an inverted
+# index instead of a full table scan.
+SEARCH_INDEX_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS book_search
+    USING fts5(title, author_name, tokenize='trigram')
+    """,
+    # Triggers are dropped and recreated so existing databases pick up changes.
+    "DROP TRIGGER IF EXISTS book_search_book_insert",
+    """
+    CREATE TRIGGER book_search_book_insert AFTER INSERT ON book
+    BEGIN
+        INSERT INTO book_search (rowid, title, author_name)
+        VALUES (new.id, new.title, new.author_name);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS book_search_book_delete",
+    """
+    CREATE TRIGGER book_search_book_delete AFTER DELETE ON book
+    BEGIN
+        DELETE FROM book_search WHERE rowid = old.id;
+    END
+    """,
+    # Author renames reach the index through book.author_name (see below).
+    "DROP TRIGGER IF EXISTS book_search_book_update",
+    """
+    CREATE TRIGGER book_search_book_update AFTER UPDATE OF title, author_name ON book
+    BEGIN
+        DELETE FROM book_search WHERE rowid = old.id;
+        INSERT INTO book_search (rowid, title, author_name)
+        VALUES (new.id, new.title, new.author_name);
+    END
+    """,
+)
+
+AUTHOR_NAME_SYNC_DDL = (
+    "DROP TRIGGER IF EXISTS book_author_name_sync",
+    """
+    CREATE TRIGGER book_author_name_sync AFTER UPDATE OF name ON author
+    BEGIN
+        UPDATE book SET author_name = new.name WHERE author_id = new.id;
+    END
+    """,
+)
+
+
+def create_author_name_sync(connection) -> None:
+    """Add and backfill `book.author_name` if missing, and keep it in sync.
+
+    `create_all()` does not add columns to an existing table, so older databases
+    get the column via ALTER TABLE here. A trigger copies author renames to the
+    books; new books get the name from the code that inserts them.
+
+    Args:
+        connection: An open SQLAlchemy connection (inside a transaction).
+    """
+    columns = {
+        row[1] for row in connection.exec_driver_sql("PRAGMA table_info(book)")
+    }
+    if "author_name" not in columns:
+        connection.exec_driver_sql(
+            "ALTER TABLE book ADD COLUMN author_name VARCHAR(255) NOT NULL DEFAULT ''"
+        )
+        connection.exec_driver_sql(
+            "UPDATE book SET author_name = "
+            "(SELECT name FROM author WHERE author.id = book.author_id)"
+        )
+
+    for statement in AUTHOR_NAME_SYNC_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def create_search_index(connection) -> None:
+    """Create the `book_search` FTS5 table if missing and (re)create its sync triggers.
+
+    When the table is created for the first time it is filled from the existing
+    book rows; afterwards the triggers keep it up to date. Requires
+    `book.author_name` (see `create_author_name_sync`).
+
+    Args:
+        connection: An open SQLAlchemy connection (inside a transaction).
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'book_search'"
+    ).first()
+
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+    if not exists:
+        connection.exec_driver_sql(
+            "INSERT INTO book_search (rowid, title, author_name) "
+            "SELECT id, title, author_name FROM book"
+        )
+
+
+# Largest value a SQLite INTEGER (BigInteger) column can hold.
+MAX_SQLITE_INTEGER = 2**63 - 1
+
+
+def convert_legacy_book_rows(rows, normalize_isbn) -> list[dict]:
+    """Convert rows of a text-ISBN `book` table into rows for the current table.
+
+    ISBNs are converted with `normalize_isbn`; values stored before ISBN-10/13
+    validation keep their digits. Every row is checked before anything is written,
+    so a migration either converts all books or none.
+
+    Args:
+        rows: (id, isbn, title, publication_year, author_id, author name or None).
+        normalize_isbn: ISBN parser returning an int or None (app.normalize_isbn).
+
+    Returns:
+        List of dicts ready for `insert(Book)`.
+
+    Raises:
+        RuntimeError: Listing every row whose ISBN has no digits, does not fit in
+            64 bits or duplicates another book's converted ISBN, and every book
+            whose author row is missing.
+    """
+    converted = []
+    problems = []
+    book_ids_by_isbn = {}
+
+    for book_id, raw_isbn, title, publication_year, author_id, author_name in rows:
+        raw_isbn = str(raw_isbn)
+        digits = re.sub(r"\D", "", raw_isbn)
+        isbn = normalize_isbn(raw_isbn) or (int(digits) if digits else None)
+
+        if isbn is None:
+            problems.append(f"book {book_id}: ISBN {raw_isbn!r} contains no digits")
+        elif isbn > MAX_SQLITE_INTEGER:
+            problems.append(f"book {book_id}: ISBN {raw_isbn!r} is too long for an integer")
+        elif isbn in book_ids_by_isbn:
+            problems.append(
+                f"book {book_id}: ISBN {raw_isbn!r} is the same book as "
+                f"book {book_ids_by_isbn[isbn]} (both become {isbn})"
+            )
+        else:
+            book_ids_by_isbn[isbn] = book_id
+
+        if author_name is None:
+            problems.append(f"book {book_id}: author {author_id} does not exist")
+
+        converted.append(
+            {
+                "id": book_id,
+                "isbn": isbn,
+                "title": title,
+                "publication_year": publication_year,
+                "author_id": author_id,
+                "author_name": author_name,
+            }
+        )
+
+    if problems:
+        raise RuntimeError(
+            "Cannot convert book.isbn to integers; fix these rows and re-run db-init:\n  "
+            + "\n  ".join(problems)
+        )
+
+    return converted
+
+
+def migrate_isbn_to_integer(normalize_isbn) -> None:
+    """Rebuild an older `book` table whose isbn column is still text.
+
+    SQLite cannot change a column type in place, and a VARCHAR column would keep
+    storing the new integer ISBNs as text. So the old table is renamed aside, the
+    current `book` table is created and the rows are copied over with their ISBNs
+    converted (see `convert_legacy_book_rows`; author names come from `author`).
+    Does nothing once isbn is an integer column.
+
+    pysqlite commits DDL implicitly, so its transaction handling is switched off
+    and the whole rebuild runs in one explicit SQLite transaction: on any error
+    nothing is changed.
+
+    Args:
+        normalize_isbn: ISBN parser returning an int or None. Passed in by app.py,
+            which owns input validation (importing it here would be circular).
+
+    Raises:
+        RuntimeError: If rows cannot be converted or the copy is incomplete.
+    """
+    with db.engine.connect() as connection:
+        column_types = {
+            row[1]: row[2].upper()
+            for row in connection.exec_driver_sql("PRAGMA table_info(book)")
+        }
+        if column_types["isbn"] in ("BIGINT", "INTEGER"):
+            return
+        connection.rollback()
+
+        dbapi_connection = connection.connection.driver_connection
+        isolation_level = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+        try:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                rebuild_book_table(connection, normalize_isbn)
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+        finally:
+            dbapi_connection.isolation_level = isolation_level
+
+
+def rebuild_book_table(connection, normalize_isbn) -> None:
+    """Copy the books of a text-ISBN table into a new `book` table.
+
+    Helper for `migrate_isbn_to_integer`; must run inside its transaction.
+    The search and author-name triggers are dropped first (they would otherwise
+    follow or reference the renamed table); `init_database` recreates them.
+
+    Args:
+        connection: SQLAlchemy connection with an explicit transaction open.
+        normalize_isbn: ISBN parser passed on to `convert_legacy_book_rows`.
+    """
+    # Read and validate every row before changing the schema.
+    rows = connection.exec_driver_sql(
+        "SELECT book.id, book.isbn, book.title, book.publication_year, "
+        "book.author_id, author.name "
+        "FROM book LEFT JOIN author ON author.id = book.author_id"
+    ).all()
+    converted = convert_legacy_book_rows(rows, normalize_isbn)
+
+    for (trigger,) in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        "AND (name LIKE 'book\\_search\\_%' ESCAPE '\\' OR name = 'book_author_name_sync')"
+    ).all():
+        connection.exec_driver_sql(f'DROP TRIGGER "{trigger}"')
+
+    # Named indexes move with the renamed table; free their names for the new one.
+    for index in connection.exec_driver_sql("PRAGMA index_list(book)").all():
+        if index[3] == "c":
+            connection.exec_driver_sql(f'DROP INDEX "{index[1]}"')
+
+    connection.exec_driver_sql("ALTER TABLE book RENAME TO book_old")
+    Book.__table__.create(connection)
+
+    if converted:
+        connection.execute(insert(Book), converted)
+
+    copied = connection.exec_driver_sql("SELECT COUNT(*) FROM book").scalar()
+    expected = connection.exec_driver_sql("SELECT COUNT(*) FROM book_old").scalar()
+    if copied != expected:
+        raise RuntimeError(
+            f"ISBN migration copied {copied} of {expected} books; nothing was changed."
+        )
+
+    connection.exec_driver_sql("DROP TABLE book_old")